@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Per-message cost of binding an envelope to handler arguments.
+
+``legacy`` rebuilds the merged kwargs dict and a ``dispatch`` lambda for every
+message and filters it again in ``error_handler_decorator``, as
+``AsyncCorotine.handle`` used to. ``plan`` uses the ``Binding`` computed at
+``subscribe()`` time.
+
+    $ python benchmarks/bench_binding.py
+    $ python benchmarks/bench_binding.py --count 500000
+"""
+import os
+import sys
+import timeit
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fire
+import umuus_aioredis_pubsub
+
+
+def task(name, count=0):
+    return count
+
+
+def task_coerced(name: str, count: int = 0):
+    return count
+
+
+def legacy(fn, data, send):
+    payload = data.get('payload')
+    kw = ({
+        key: value
+        for key, value in (
+            [] + (isinstance(payload, dict) and list(payload.items()) or []) +
+            list(data.items()) + list(
+                dict(dispatch=lambda name, **kwargs: send(
+                    name, dict(type=name, payload=kwargs)), ).items()))
+    })
+    return fn(**kw)
+
+
+def plan(binding, data, dispatcher):
+    kw = binding.bind(data)
+    if binding.wants_dispatch:
+        kw['dispatch'] = dispatcher
+    return umuus_aioredis_pubsub.call_handler(binding.fn, (), kw)
+
+
+def bench(count=200000, repeat=3):
+    data = dict(
+        type='bench:task',
+        payload=dict(name='James', count='3', extra=[1, 2, 3]),
+        meta=dict(id='0' * 32, reply_to='bench:reply:' + '0' * 32))
+    wrapped = umuus_aioredis_pubsub.error_handler_decorator(task)
+    binding = umuus_aioredis_pubsub.Binding(task)
+    coerced = umuus_aioredis_pubsub.Binding(task_coerced, coerce=True)
+    send = lambda *args, **kwargs: None
+    assert legacy(wrapped, data, send) == plan(binding, data, send) == '3'
+    assert plan(coerced, data, send) == 3
+
+    def measure(fn):
+        return min(timeit.repeat(fn, number=count, repeat=repeat)) / count * 1e6
+
+    return dict(
+        legacy_us=measure(lambda: legacy(wrapped, data, send)),
+        plan_us=measure(lambda: plan(binding, data, send)),
+        coerced_us=measure(lambda: plan(coerced, data, send)))
+
+
+def run(count=200000):
+    print('legacy %(legacy_us)5.2f us/message  plan %(plan_us)5.2f us/message'
+          '  plan+coerce %(coerced_us)5.2f us/message' % bench(count))
+
+
+if __name__ == '__main__':
+    fire.Fire(run)
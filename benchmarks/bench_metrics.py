@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Per-message cost of the built-in metrics on the handler path.
+
+Messages go through ``AsyncCorotine.handle`` with publishing replaced by a
+no-op, once with ``Metrics.enabled`` off and once on.
+
+    $ python benchmarks/bench_metrics.py
+    $ python benchmarks/bench_metrics.py --count 200000
+"""
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fire
+import umuus_aioredis_pubsub
+
+
+class Instance(umuus_aioredis_pubsub.AsyncRedisPubSub):
+    async def publish(self, channel, obj, codec=None):
+        return 0
+
+
+def task(x):
+    return x
+
+
+async def handle(coroutine, messages):
+    started = time.perf_counter()
+    for message in messages:
+        await coroutine.handle(message)
+    return time.perf_counter() - started
+
+
+def bench(count=100000, repeat=3):
+    instance = Instance(name='bench')
+    coroutine = instance.subscribe(task, pattern='bench:task')
+    messages = [
+        umuus_aioredis_pubsub.Message(
+            'bench:task',
+            dict(type='bench:task', payload=dict(x=i), meta=dict(id=str(i))))
+        for i in range(count)
+    ]
+    loop = asyncio.get_event_loop()
+    res = {}
+    for enabled in [False, True]:
+        instance.metrics.enabled = enabled
+        res[enabled] = min(
+            loop.run_until_complete(handle(coroutine, messages))
+            for _ in range(repeat)) / count * 1e6
+    assert instance.metrics.counters['handled', 'bench:task'] == count * repeat
+    return dict(
+        disabled_us=res[False],
+        enabled_us=res[True],
+        overhead_us=res[True] - res[False])
+
+
+def run(count=100000):
+    res = bench(count)
+    print('disabled %(disabled_us)6.2f us/message  enabled %(enabled_us)6.2f '
+          'us/message  overhead %(overhead_us)5.2f us/message' % res)
+
+
+if __name__ == '__main__':
+    fire.Fire(run)
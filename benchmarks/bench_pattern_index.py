@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Lookup cost of ``PatternIndex`` against a linear scan of every pattern.
+
+    $ python benchmarks/bench_pattern_index.py
+    $ python benchmarks/bench_pattern_index.py --sizes '[10, 1000]'
+"""
+import os
+import random
+import sys
+import timeit
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fire
+import umuus_aioredis_pubsub
+
+
+def make_patterns(size, seed=0):
+    rnd = random.Random(seed)
+    patterns = []
+    for i in range(size):
+        service = 'svc%d' % (i // 10)
+        kind = rnd.random()
+        if kind < 0.7:
+            patterns.append('%s:task%d' % (service, i))
+        elif kind < 0.8:
+            patterns.append('%s:*' % service)
+        elif kind < 0.9:
+            patterns.append('%s:job:?' % service)
+        else:
+            patterns.append('%s:[ab]*:%d' % (service, i))
+    return patterns
+
+
+def make_channels(patterns, count=1000, seed=1):
+    rnd = random.Random(seed)
+    return [
+        rnd.choice(patterns).replace('*', 'x').replace('?', '1').replace(
+            '[ab]', 'a') for _ in range(count)
+    ]
+
+
+def bench(size, number=3, linear_limit=10000):
+    patterns = make_patterns(size)
+    channels = make_channels(patterns)
+    index = umuus_aioredis_pubsub.PatternIndex()
+    for pattern in patterns:
+        index.add(pattern, pattern)
+    compiled = [(umuus_aioredis_pubsub.compile_pattern(_), _)
+                for _ in patterns]
+
+    def lookup():
+        for channel in channels:
+            index.match(channel)
+
+    def linear():
+        for channel in channels:
+            [_ for regex, _ in compiled if regex.match(channel)]
+
+    res = dict(
+        patterns=size,
+        index_us=min(timeit.repeat(lookup, number=1, repeat=number)) /
+        len(channels) * 1e6,
+    )
+    if size <= linear_limit:
+        res.update(linear_us=min(timeit.repeat(linear, number=1, repeat=1)) /
+                   len(channels) * 1e6)
+    assert all(
+        sorted(index.match(_)) == sorted(p for regex, p in compiled
+                                         if regex.match(_))
+        for _ in channels[:50])
+    return res
+
+
+def run(sizes=(10, 1000, 100000)):
+    for size in sizes:
+        res = bench(size)
+        print('%(patterns)7d patterns: index %(index_us)8.2f us/lookup' % res +
+              ('  linear %(linear_us)10.2f us/lookup' % res
+               if 'linear_us' in res else ''))
+
+
+if __name__ == '__main__':
+    fire.Fire(run)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Latency of interactive dispatches while a worker is busy with bulk work.
+
+One worker runs slow bulk handlers on several patterns and a fast
+interactive one, under a shared ``options.scheduler.concurrency`` limit. A
+backlog of bulk messages is sent, then interactive ``dispatch`` calls are
+timed: once with every pattern at priority 0 and once with the interactive
+one in a higher lane.
+
+    $ python benchmarks/bench_priority.py
+    $ python benchmarks/bench_priority.py --address redis://localhost:6379 --priority 3
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fire
+from common import make_instance, percentile, start, stop
+from fake_redis import FakeRedis
+
+
+async def bench(address, priority, backlog, count, concurrency, bulk_ms,
+                bulk_patterns):
+    client = make_instance('bench-client', address)
+    worker = make_instance(
+        'bench-worker', address, scheduler=dict(concurrency=concurrency))
+
+    async def bulk(i):
+        await asyncio.sleep(bulk_ms / 1000)
+
+    async def interactive(i):
+        return i
+
+    for i in range(bulk_patterns):
+        worker.subscribe(bulk, pattern='bench:bulk:%d' % i,
+                         max_concurrency=concurrency, ignore_result=True)
+    worker.subscribe(interactive, pattern='bench:interactive',
+                     max_concurrency=concurrency, priority=priority)
+    tasks = await start(client) + await start(worker)
+    latencies = []
+    try:
+        for i in range(bulk_patterns):
+            await client.dispatch_many(
+                'bench:bulk:%d' % i,
+                [dict(i=_) for _ in range(backlog // bulk_patterns)],
+                wait=False)
+        await asyncio.sleep(0.05)
+        for i in range(count):
+            started = time.perf_counter()
+            await client.dispatch('bench:interactive', i=i)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await stop(*tasks)
+    return dict(
+        priority=priority,
+        p50_ms=percentile(latencies, 0.5) * 1e3,
+        p99_ms=percentile(latencies, 0.99) * 1e3)
+
+
+def run(address='', priority=5, backlog=4000, count=200, concurrency=4,
+        bulk_ms=5, bulk_patterns=8):
+    logging.disable(logging.WARNING)
+    loop = asyncio.get_event_loop()
+    server = None
+    if not address:
+        server = loop.run_until_complete(FakeRedis().start())
+        address = server.address
+    try:
+        for lane in [0, priority]:
+            print('interactive priority %(priority)d  p50 %(p50_ms)6.2f ms  '
+                  'p99 %(p99_ms)6.2f ms' % loop.run_until_complete(
+                      bench(address, lane, backlog, count, concurrency,
+                            bulk_ms, bulk_patterns)))
+    finally:
+        if server:
+            server.close()
+
+
+if __name__ == '__main__':
+    fire.Fire(run)
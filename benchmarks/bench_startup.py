@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Import time of the package and time from start to ready.
+
+``import_ms`` is the best wall time of a fresh ``python -c "import
+umuus_aioredis_pubsub"``. ``ready_ms`` is the time from scheduling
+``get_coroutines()`` until ``wait_ready()`` returns, against the in-process
+fake Redis (or ``--address``). Pass budgets to fail when a change makes either
+slower.
+
+    $ python benchmarks/bench_startup.py
+    $ python benchmarks/bench_startup.py --budget_import_ms 400 --budget_ready_ms 50
+"""
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fire
+import umuus_aioredis_pubsub
+from fake_redis import FakeRedis
+
+
+def measure_import(repeat=5):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(
+            [_ for _ in [root, os.environ.get('PYTHONPATH')] if _]))
+    res = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.check_call(
+            [sys.executable, '-c', 'import umuus_aioredis_pubsub'], env=env)
+        res.append(time.perf_counter() - started)
+    return min(res) * 1e3
+
+
+async def measure_ready(address, handlers=10):
+    instance = umuus_aioredis_pubsub.AsyncRedisPubSub(
+        name='bench-startup',
+        options=dict(redis=dict(address=address, password=None)))
+    for i in range(handlers):
+        instance.subscribe(lambda: None, pattern='bench:startup:%d' % i)
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(_) for _ in instance.get_coroutines()]
+    await instance.wait_ready()
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return elapsed * 1e3
+
+
+def run(address='', repeat=5, budget_import_ms=0, budget_ready_ms=0):
+    logging.disable(logging.WARNING)
+    loop = asyncio.get_event_loop()
+    server = None
+    if not address:
+        server = loop.run_until_complete(FakeRedis().start())
+        address = server.address
+    try:
+        ready_ms = min(
+            loop.run_until_complete(measure_ready(address))
+            for _ in range(repeat))
+    finally:
+        if server:
+            server.close()
+    import_ms = measure_import(repeat)
+    print('import %7.1f ms  ready %7.1f ms' % (import_ms, ready_ms))
+    failed = [
+        name for name, value, budget in [
+            ('import', import_ms, budget_import_ms),
+            ('ready', ready_ms, budget_ready_ms),
+        ] if budget and value > budget
+    ]
+    if failed:
+        print('over budget: ' + ', '.join(failed))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    fire.Fire(run)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""End-to-end benchmarks of publishing, handling and dispatching.
+
+Runs against ``--address`` or, by default, in-process fake Redis servers (see
+``benchmarks/fake_redis.py``); ``--nodes N`` shards over N of them. It
+measures:
+
+* publish throughput (sequential and concurrent ``publish``),
+* handler throughput across payload sizes and numbers of handlers,
+* ``dispatch`` round-trip latency (p50 / p99),
+* memory per in-flight ``dispatch`` across payload sizes and numbers of
+  handlers.
+
+Results are printed, or written with ``--output``, as JSON so runs can be
+compared.
+
+    $ python benchmarks/bench_suite.py --output before.json
+    $ python benchmarks/bench_suite.py --address redis://localhost:6379 --count 20000
+    $ python benchmarks/bench_suite.py --nodes 3
+"""
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fire
+from common import make_instance, percentile, start, stop
+from fake_redis import FakeRedis
+
+
+async def bench_publish(address, count, size):
+    instance = make_instance('bench-publish', address)
+    tasks = await start(instance)
+    payload = dict(data='x' * size)
+    try:
+        started = time.perf_counter()
+        for _ in range(count):
+            await instance.publish('bench:publish', payload)
+        sequential = count / (time.perf_counter() - started)
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            instance.publish('bench:publish', payload) for _ in range(count)
+        ])
+        concurrent = count / (time.perf_counter() - started)
+    finally:
+        await stop(*tasks)
+    return dict(
+        payload_size=size,
+        sequential_per_second=sequential,
+        concurrent_per_second=concurrent)
+
+
+async def bench_handlers(address, count, size, handlers):
+    client = make_instance('bench-client', address)
+    worker = make_instance('bench-worker', address)
+    done = asyncio.Event()
+    handled = [0]
+
+    def task(data):
+        handled[0] += 1
+        if handled[0] == count:
+            done.set()
+
+    for i in range(handlers):
+        worker.subscribe(task, pattern='bench:handler:%d' % i,
+                         ignore_result=True, max_concurrency=16)
+    tasks = await start(client) + await start(worker)
+    try:
+        started = time.perf_counter()
+        for i in range(handlers):
+            await client.send_many('bench:handler:%d' % i, [
+                dict(type='bench', payload=dict(data='x' * size))
+                for _ in range(count // handlers + (i < count % handlers))
+            ])
+        await asyncio.wait_for(done.wait(), 60)
+        elapsed = time.perf_counter() - started
+    finally:
+        await stop(*tasks)
+    return dict(
+        payload_size=size,
+        handlers=handlers,
+        handled_per_second=count / elapsed)
+
+
+async def bench_dispatch(address, count, size):
+    client = make_instance('bench-client', address)
+    worker = make_instance('bench-worker', address)
+    worker.subscribe(lambda data: data, pattern='bench:echo')
+    tasks = await start(client) + await start(worker)
+    latencies = []
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            await client.dispatch('bench:echo', data='x' * size)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await stop(*tasks)
+    return dict(
+        payload_size=size,
+        p50_ms=percentile(latencies, 0.5) * 1e3,
+        p99_ms=percentile(latencies, 0.99) * 1e3)
+
+
+async def bench_memory(address, count, size, handlers):
+    client = make_instance('bench-client', address)
+    worker = make_instance('bench-worker', address)
+    release = asyncio.Event()
+
+    async def hold(data):
+        await release.wait()
+
+    for i in range(handlers):
+        worker.subscribe(hold, pattern='bench:hold:%d' % i,
+                         max_concurrency=count)
+    tasks = await start(client) + await start(worker)
+    try:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        futures = [
+            asyncio.ensure_future(
+                client.dispatch('bench:hold:%d' % (i % handlers),
+                                data='x' * size)) for i in range(count)
+        ]
+        while len(client.pending) < count or sum(
+                len(_.tasks) for _ in worker.coroutines) < count:
+            await asyncio.sleep(0.01)
+        in_flight = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        release.set()
+        await asyncio.gather(*futures)
+    finally:
+        await stop(*tasks)
+    return dict(
+        payload_size=size,
+        handlers=handlers,
+        in_flight=count,
+        bytes_per_request=in_flight / count)
+
+
+def run(address='',
+        count=2000,
+        payload_sizes=(16, 1024, 65536),
+        handler_counts=(1, 10, 100),
+        nodes=1,
+        output=''):
+    logging.disable(logging.WARNING)
+    loop = asyncio.get_event_loop()
+    servers = []
+    if not address:
+        servers = [
+            loop.run_until_complete(FakeRedis().start())
+            for _ in range(nodes)
+        ]
+        address = [_.address for _ in servers]
+    results = dict(
+        meta=dict(
+            python=platform.python_version(),
+            platform=platform.platform(),
+            redis=servers and 'fake' or address,
+            nodes=len(servers) or 1,
+            count=count,
+            time=time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        ),
+        publish=[],
+        handlers=[],
+        dispatch=[],
+        memory=[],
+    )
+    try:
+        for size in payload_sizes:
+            results['publish'].append(
+                loop.run_until_complete(bench_publish(address, count, size)))
+            for handlers in handler_counts:
+                results['handlers'].append(
+                    loop.run_until_complete(
+                        bench_handlers(address, count, size, handlers)))
+            results['dispatch'].append(
+                loop.run_until_complete(
+                    bench_dispatch(address, min(count, 1000), size)))
+            for handlers in handler_counts:
+                results['memory'].append(
+                    loop.run_until_complete(
+                        bench_memory(address, min(count, 1000), size,
+                                     handlers)))
+    finally:
+        for server in servers:
+            server.close()
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    fire.Fire(run)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the benchmarks that run instances end to end.
+
+``address`` is a Redis URL, or a list of them to shard over several nodes.
+"""
+import asyncio
+import umuus_aioredis_pubsub
+
+
+def make_instance(name, address, **options):
+    return umuus_aioredis_pubsub.AsyncRedisPubSub(
+        name=name,
+        options=dict(
+            options,
+            redis=dict(
+                options.get('redis', {}),
+                **(isinstance(address, list) and dict(nodes=address)
+                   or dict(address=address)),
+                password=None)))
+
+
+async def start(instance):
+    tasks = [asyncio.ensure_future(_) for _ in instance.get_coroutines()]
+    await instance.wait_ready()
+    return tasks
+
+
+async def stop(*tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
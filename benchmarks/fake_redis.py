@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""An in-process server speaking enough of the Redis protocol for Pub/Sub.
+
+It supports ``PING``, ``AUTH``, ``SELECT``, ``PUBLISH``, ``PUBSUB NUMSUB``,
+``PUBSUB NUMPAT``, ``SUBSCRIBE``, ``PSUBSCRIBE``, ``UNSUBSCRIBE`` and
+``PUNSUBSCRIBE``, and for the Streams transport ``XADD``, ``XGROUP CREATE``,
+``XREADGROUP``, ``XACK``, ``XPENDING`` and ``XCLAIM``. That is enough to run
+the benchmarks and the tests without a Redis server.
+Start several to stand in for the nodes of a sharded setup.
+
+    $ python benchmarks/fake_redis.py --port 6390
+"""
+import asyncio
+import collections
+import os
+import sys
+import time
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import attr
+import fire
+import umuus_aioredis_pubsub
+
+
+def encode(value):
+    if isinstance(value, str):
+        return b'+%s\r\n' % value.encode('utf-8')
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, bytes):
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+    if isinstance(value, Exception):
+        text = str(value)
+        if not text.split(' ', 1)[0].isupper():
+            text = 'ERR ' + text
+        return b'-%s\r\n' % text.encode('utf-8')
+    if value is None:
+        return b'$-1\r\n'
+    return b'*%d\r\n' % len(value) + b''.join(map(encode, value))
+
+
+async def read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if line[:1] != b'*':
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        size = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(size + 2))[:-2])
+    return args
+
+
+def parse_id(value, default=0):
+    if value in (b'-', b'+'):
+        return (0, 0) if value == b'-' else (float('inf'), 0)
+    ms, _, seq = value.partition(b'-')
+    return int(ms), int(seq or default)
+
+
+def format_id(value):
+    return b'%d-%d' % value
+
+
+@attr.s()
+class Stream(object):
+    def __attrs_post_init__(self):
+        self.entries = collections.OrderedDict()
+        self.last_id = (0, 0)
+        self.groups = {}
+
+    def add(self, message_id, fields, maxlen=None):
+        if message_id == b'*':
+            ms = int(time.time() * 1000)
+            message_id = (ms, 0) if ms > self.last_id[0] else (
+                self.last_id[0], self.last_id[1] + 1)
+        else:
+            message_id = parse_id(message_id)
+        if message_id <= self.last_id:
+            raise Exception('The ID specified in XADD is equal or smaller '
+                            'than the target stream top item')
+        self.entries[message_id] = fields
+        self.last_id = message_id
+        while maxlen is not None and len(self.entries) > maxlen:
+            self.entries.popitem(last=False)
+        return format_id(message_id)
+
+    def read(self, group, consumer, message_id, count=None):
+        if message_id == b'>':
+            ids = [_ for _ in self.entries if _ > group.last_id][:count]
+            for _ in ids:
+                group.pending[_] = [consumer, time.monotonic(), 1]
+                group.last_id = _
+        else:
+            ids = [
+                _ for _, (owner, delivered, deliveries) in sorted(
+                    group.pending.items())
+                if owner == consumer and _ > parse_id(message_id)
+            ][:count]
+        return [[format_id(_), self.entries.get(_)] for _ in ids]
+
+
+@attr.s()
+class Group(object):
+    last_id = attr.ib((0, 0))
+
+    def __attrs_post_init__(self):
+        self.pending = {}
+
+
+@attr.s()
+class FakeRedis(object):
+    host = attr.ib('127.0.0.1')
+    port = attr.ib(0)
+
+    def __attrs_post_init__(self):
+        self.channels = collections.defaultdict(set)
+        self.patterns = collections.defaultdict(set)
+        self.regexes = {}
+        self.subscriptions = collections.defaultdict(set)
+        self.streams = {}
+        self.added = None
+        self.server = None
+
+    @property
+    def address(self):
+        return 'redis://%s:%d' % (self.host, self.port)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def close(self):
+        self.server.close()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                args = await read_command(reader)
+                if not args:
+                    break
+                reply = self.execute(writer, args[0].upper(), args[1:])
+                if asyncio.iscoroutine(reply):
+                    reply = await reply
+                writer.write(reply)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for kind, name in self.subscriptions.pop(writer, ()):
+                self.remove(writer, kind, name)
+            writer.close()
+
+    def execute(self, writer, command, args):
+        if command == b'PING':
+            return encode(args[0] if args else 'PONG')
+        if command in (b'AUTH', b'SELECT'):
+            return encode('OK')
+        if command == b'PUBLISH':
+            return encode(self.publish(*args))
+        if command == b'PUBSUB' and args and args[0].upper() == b'NUMSUB':
+            return encode([
+                _ for channel in args[1:]
+                for _ in [channel, len(self.channels.get(channel, ()))]
+            ])
+        if command == b'PUBSUB' and args and args[0].upper() == b'NUMPAT':
+            return encode(len(self.patterns))
+        if command == b'XREADGROUP':
+            return self.xreadgroup(*args)
+        if command in (b'SUBSCRIBE', b'PSUBSCRIBE'):
+            return b''.join(
+                self.add(writer, command[:-9].lower() + b'subscribe', _)
+                for _ in args)
+        if command in (b'UNSUBSCRIBE', b'PUNSUBSCRIBE'):
+            kind = command[:-11].lower() + b'subscribe'
+            names = args or [
+                name for _, name in self.subscriptions[writer] if _ == kind
+            ]
+            return b''.join(
+                self.remove(writer, kind, _, command.lower())
+                for _ in names)
+        if command in self.stream_commands:
+            try:
+                return getattr(self, command.lower().decode())(*args)
+            except Exception as err:
+                return encode(err)
+        return encode(Exception('unknown command %r' % command))
+
+    stream_commands = (b'XADD', b'XGROUP', b'XACK', b'XPENDING', b'XCLAIM')
+
+    def get_group(self, key, name):
+        group = key in self.streams and self.streams[key].groups.get(name)
+        if not group:
+            raise Exception('NOGROUP No such key %r or consumer group %r' %
+                            (key, name))
+        return group
+
+    def xadd(self, key, *args):
+        maxlen = None
+        if args[0].upper() == b'MAXLEN':
+            args = args[2:] if args[1] in (b'~', b'=') else args[1:]
+            maxlen, args = int(args[0]), args[1:]
+        message_id = self.streams.setdefault(key, Stream()).add(
+            args[0], list(args[1:]), maxlen)
+        if self.added is not None:
+            self.added.set()
+            self.added = None
+        return encode(message_id)
+
+    def xgroup(self, command, key, name, message_id, *flags):
+        if command.upper() != b'CREATE':
+            raise Exception('unknown XGROUP subcommand %r' % command)
+        if key not in self.streams and b'MKSTREAM' not in map(
+                bytes.upper, flags):
+            raise Exception('The XGROUP subcommand requires the key to exist')
+        stream = self.streams.setdefault(key, Stream())
+        if name in stream.groups:
+            raise Exception('BUSYGROUP Consumer Group name already exists')
+        stream.groups[name] = Group(
+            stream.last_id if message_id == b'$' else parse_id(message_id))
+        return encode('OK')
+
+    async def xreadgroup(self, *args):
+        group, consumer = args[1:3]
+        options, streams = {}, []
+        for i, arg in enumerate(args[3:], 3):
+            if arg.upper() == b'STREAMS':
+                streams = args[i + 1:]
+                break
+            options[arg.upper()] = args[i + 1] if i + 1 < len(args) else None
+        keys, ids = streams[:len(streams) // 2], streams[len(streams) // 2:]
+        count = int(options[b'COUNT']) if b'COUNT' in options else None
+        block = int(options[b'BLOCK']) if b'BLOCK' in options else None
+        deadline = block and time.monotonic() + block / 1000
+        while True:
+            try:
+                entries = [[
+                    key,
+                    self.streams[key].read(
+                        self.get_group(key, group), consumer, message_id,
+                        count)
+                ] for key, message_id in zip(keys, ids)]
+            except Exception as err:
+                return encode(err)
+            entries = [_ for _ in entries if _[1]]
+            if entries or block is None or b'>' not in ids:
+                return encode(entries or None)
+            if self.added is None:
+                self.added = asyncio.Event()
+            try:
+                await asyncio.wait_for(
+                    self.added.wait(),
+                    deadline and max(deadline - time.monotonic(), 0) or None)
+            except asyncio.TimeoutError:
+                return encode(None)
+
+    def xack(self, key, name, *ids):
+        group = self.get_group(key, name)
+        return encode(
+            sum(group.pending.pop(parse_id(_), None) is not None for _ in ids))
+
+    def xpending(self, key, name, *args):
+        group, now = self.get_group(key, name), time.monotonic()
+        pending = sorted(group.pending.items())
+        if not args:
+            consumers = collections.Counter(
+                consumer for _, (consumer, delivered, deliveries) in pending)
+            return encode([
+                len(pending),
+                pending and format_id(pending[0][0]) or None,
+                pending and format_id(pending[-1][0]) or None,
+                [[_, str(count).encode()] for _, count in consumers.items()]
+                or None,
+            ])
+        start, end, count = parse_id(args[0]), parse_id(args[1]), int(args[2])
+        return encode([
+            [format_id(_), consumer, int((now - delivered) * 1000), deliveries]
+            for _, (consumer, delivered, deliveries) in pending
+            if start <= _ <= end and (len(args) < 4 or consumer == args[3])
+        ][:count])
+
+    def xclaim(self, key, name, consumer, min_idle, *args):
+        group = self.get_group(key, name)
+        stream, now, res = self.streams[key], time.monotonic(), []
+        for message_id in args:
+            try:
+                _ = parse_id(message_id)
+            except ValueError:
+                break
+            entry = group.pending.get(_)
+            if not entry or (now - entry[1]) * 1000 < int(min_idle):
+                continue
+            if _ not in stream.entries:
+                res.append([message_id, None])
+                continue
+            group.pending[_] = [consumer, now, entry[2] + 1]
+            res.append([message_id, stream.entries[_]])
+        return encode(res)
+
+    def add(self, writer, kind, name):
+        if kind == b'psubscribe':
+            self.patterns[name].add(writer)
+            self.regexes[name] = umuus_aioredis_pubsub.compile_pattern(
+                name.decode('latin-1'))
+        else:
+            self.channels[name].add(writer)
+        self.subscriptions[writer].add((kind, name))
+        return encode([kind, name, len(self.subscriptions[writer])])
+
+    def remove(self, writer, kind, name, reply=b''):
+        subscribers = (kind == b'psubscribe' and self.patterns
+                       or self.channels)
+        subscribers[name].discard(writer)
+        if not subscribers[name]:
+            subscribers.pop(name)
+            self.regexes.pop(name, None)
+        self.subscriptions.get(writer, set()).discard((kind, name))
+        return reply and encode(
+            [reply, name, len(self.subscriptions.get(writer, ()))])
+
+    def publish(self, channel, data):
+        count = 0
+        for writer in self.channels.get(channel, ()):
+            writer.write(encode([b'message', channel, data]))
+            count += 1
+        text = channel.decode('latin-1')
+        for pattern, writers in self.patterns.items():
+            if self.regexes[pattern].match(text):
+                for writer in writers:
+                    writer.write(
+                        encode([b'pmessage', pattern, channel, data]))
+                    count += 1
+        return count
+
+
+def serve(host='127.0.0.1', port=6390):
+    loop = asyncio.get_event_loop()
+    server = loop.run_until_complete(FakeRedis(host, port).start())
+    print(server.address)
+    loop.run_forever()
+
+
+if __name__ == '__main__':
+    fire.Fire(serve)
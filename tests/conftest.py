@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import os
+import sys
+import pytest
+
+sys.path[:0] = [
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        'benchmarks'),
+]
+
+import umuus_aioredis_pubsub
+import common
+from fake_redis import FakeRedis
+
+logging.getLogger(umuus_aioredis_pubsub.__name__).setLevel(logging.WARNING)
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+
+@pytest.fixture
+def fake_redis(loop):
+    server = loop.run_until_complete(FakeRedis().start())
+    yield server
+    server.close()
+    loop.run_until_complete(server.server.wait_closed())
+
+
+@pytest.fixture
+def make(fake_redis):
+    def make(name='test', address=None, **options):
+        return common.make_instance(name, address or fake_redis.address,
+                                    **options)
+
+    return make
+
+
+@pytest.fixture
+def connect(loop):
+    tasks = []
+
+    async def connect(*instances):
+        for instance in instances:
+            tasks.extend(
+                asyncio.ensure_future(_) for _ in instance.get_coroutines())
+            await asyncio.wait_for(instance.wait_ready(), 5)
+        return instances
+
+    yield connect
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
@@ -0,0 +1,96 @@
+import asyncio
+import uuid
+import pytest
+
+
+def make_blocked_worker(make, overflow):
+    worker = make('worker')
+    release, handled = asyncio.Event(), []
+
+    async def task(i):
+        await release.wait()
+        handled.append(i)
+        return i
+
+    coroutine = worker.subscribe(task, pattern='test:queue', max_queue=2,
+                                 overflow=overflow)
+    return worker, coroutine, release, handled
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_unknown_overflow_policy_is_rejected(make):
+    with pytest.raises(ValueError):
+        make('worker').subscribe(lambda: None, pattern='test:queue',
+                                 max_queue=2, overflow='drop-oldest')
+
+
+def test_block_pauses_reading_and_resumes(loop, make, connect):
+    client = make('client')
+    worker, coroutine, release, handled = make_blocked_worker(make, 'block')
+
+    async def main():
+        await connect(client, worker)
+        for i in range(10):
+            await client.publish('test:queue', dict(payload=dict(i=i)))
+        await wait_for(lambda: coroutine.is_paused)
+        is_paused = coroutine.is_paused
+        release.set()
+        await wait_for(lambda: len(handled) == 10)
+        return is_paused
+
+    assert loop.run_until_complete(main())
+    assert handled == list(range(10))
+    assert not coroutine.is_paused
+    assert coroutine.stats['pauses'] >= 1
+    assert coroutine.stats['dropped'] == 0
+
+
+@pytest.mark.parametrize('overflow', ['drop_oldest', 'drop_newest'])
+def test_drop_policies_count_dropped_messages(loop, make, connect, overflow):
+    client = make('client')
+    worker, coroutine, release, handled = make_blocked_worker(make, overflow)
+
+    async def main():
+        await connect(client, worker)
+        for i in range(10):
+            await client.publish('test:queue', dict(payload=dict(i=i)))
+        await wait_for(lambda: coroutine.stats['received'] == 10)
+        release.set()
+        await wait_for(
+            lambda: len(handled) + coroutine.stats['dropped'] == 10)
+
+    loop.run_until_complete(main())
+    assert coroutine.stats['dropped'] > 0
+    assert len(handled) + coroutine.stats['dropped'] == 10
+    assert handled == sorted(handled)
+    assert (9 in handled) == (overflow == 'drop_oldest')
+    assert not coroutine.is_paused
+
+
+def test_shed_replies_with_an_error(loop, make, connect):
+    client = make('client')
+    worker, coroutine, release, handled = make_blocked_worker(make, 'shed')
+
+    def request(i):
+        return client.request(
+            'test:queue',
+            dict(type='test:queue', payload=dict(i=i),
+                 meta=dict(id=uuid.uuid4().hex, wants_reply=True)))
+
+    async def main():
+        await connect(client, worker)
+        requests = [asyncio.ensure_future(request(i)) for i in range(10)]
+        await wait_for(lambda: coroutine.stats['received'] == 10)
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*requests), 5)
+
+    responses = loop.run_until_complete(main())
+    errors = [_['error'] for _ in responses if 'error' in _]
+    assert errors == ['queue is full: test:queue'] * coroutine.stats['shed']
+    assert errors and len(errors) + len(handled) == 10
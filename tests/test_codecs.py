@@ -0,0 +1,57 @@
+import os
+import pytest
+import umuus_aioredis_pubsub
+
+payload = dict(name='James', count=3, tags=['a', 'b'], nested=dict(x=1.5))
+
+
+@pytest.mark.parametrize('codec', sorted(umuus_aioredis_pubsub.codecs))
+def test_codecs_round_trip(make, codec):
+    instance = make('codec', codec=codec)
+    data = instance.encode(payload)
+    assert data.startswith(umuus_aioredis_pubsub.CODEC_MARKER) == (
+        codec != 'json')
+    assert instance.decode(data) == (payload, codec)
+
+
+def test_messages_name_their_codec(make):
+    sender, receiver = make('sender', codec='json'), make('receiver')
+    for codec in umuus_aioredis_pubsub.codecs:
+        data = sender.encode(payload, codec)
+        assert receiver.decode(data) == (payload, codec)
+
+
+@pytest.mark.parametrize('codec', sorted(umuus_aioredis_pubsub.codecs))
+@pytest.mark.parametrize('algorithm',
+                         sorted(umuus_aioredis_pubsub.compressors))
+def test_compression_round_trip(make, codec, algorithm):
+    instance = make('compression', codec=codec,
+                    compression=dict(algorithm=algorithm, threshold=64))
+    large = dict(payload, text='x' * 4096)
+    data = instance.encode(large, channel='test')
+    assert len(data) < 4096
+    assert data.split(umuus_aioredis_pubsub.CODEC_MARKER)[1] == (
+        '%s+%s' % (codec, algorithm)).encode()
+    assert instance.decode(data, 'test') == (large, codec)
+    assert instance.get_compression_stats()['test']['decompressed'] == 1
+
+
+def test_small_payloads_are_not_compressed(make):
+    instance = make('compression',
+                    compression=dict(algorithm='zlib', threshold=1024))
+    data = instance.encode(payload, channel='test')
+    assert data == instance.encode(payload, 'json')
+    assert instance.decode(data) == (payload, 'json')
+    assert instance.get_compression_stats() == {}
+
+
+def test_incompressible_payloads_are_sent_raw(make):
+    pytest.importorskip('msgpack')
+    instance = make('compression', codec='msgpack',
+                    compression=dict(algorithm='zlib', threshold=64))
+    noise = dict(data=os.urandom(4096))
+    data = instance.encode(noise, channel='test')
+    assert data.split(umuus_aioredis_pubsub.CODEC_MARKER)[1] == b'msgpack'
+    assert instance.decode(data, 'test') == (noise, 'msgpack')
+    stats = instance.get_compression_stats()['test']
+    assert stats['compressed'] == 1 and stats['ratio'] > 1
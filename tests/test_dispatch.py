@@ -0,0 +1,138 @@
+import asyncio
+
+
+def test_dispatch_round_trip(loop, make, connect):
+    worker, client = make('worker'), make('client')
+    worker.subscribe(lambda x: x * 2, pattern='test:double')
+
+    async def main():
+        await connect(worker, client)
+        return await client.dispatch('test:double', x=21)
+
+    assert loop.run_until_complete(main()) == 42
+
+
+def test_payload_fields_named_like_protocol_fields(loop, make, connect):
+    worker, client = make('worker'), make('client')
+    worker.subscribe(
+        lambda id, reply_to, deadline: [id, reply_to, deadline],
+        pattern='test:user')
+    worker.subscribe(lambda **kwargs: sorted(kwargs), pattern='test:kwargs')
+
+    async def main():
+        await connect(worker, client)
+        return await asyncio.gather(
+            client.dispatch('test:user', id=5, reply_to='x', deadline=1),
+            client.dispatch('test:kwargs', id=5, wait=3))
+
+    user, kwargs = loop.run_until_complete(main())
+    assert user == [5, 'x', 1]
+    assert kwargs == ['dispatch', 'id', 'payload', 'type']
+
+
+def test_callbacks_bind_result_fields_named_like_protocol_fields(
+        loop, make, connect):
+    worker, client, listener = make('worker'), make('client'), make('other')
+    received = []
+    user = worker.subscribe(lambda: dict(id=7, name='n'), pattern='test:user')
+    listener.add_callback(user, lambda id, name: received.append((id, name)),
+                          ignore_result=True)
+
+    async def main():
+        await connect(worker, client, listener)
+        await client.dispatch('test:user')
+        await client.publish('test:user', dict(type='test:user'))
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+    loop.run_until_complete(main())
+    assert received == [(7, 'n')] * 2
+
+
+def test_dispatch_stream(loop, make, connect):
+    worker, client = make('worker'), make('client')
+
+    async def rows(count):
+        for i in range(count):
+            yield i
+
+    worker.subscribe(rows, pattern='test:rows', cache=dict(ttl=60))
+    worker.subscribe(lambda count: count, pattern='test:single',
+                     cache=dict(ttl=60))
+
+    async def collect(pattern):
+        return [_ async for _ in client.dispatch_stream(pattern, count=3)]
+
+    async def main():
+        await connect(worker, client)
+        return [
+            await collect('test:rows'),
+            await client.dispatch('test:rows', count=3),
+            await collect('test:rows'),
+            await collect('test:single'),
+            await collect('test:single'),
+        ]
+
+    assert loop.run_until_complete(main()) == [[0, 1, 2]] * 3 + [[3]] * 2
+
+
+def test_local_first_skips_local_glob_subscribers(loop, make, connect):
+    worker = make('worker')
+    client = make('client', local_first=dict(enabled=True))
+    worker.subscribe(lambda: 'remote', pattern='test:job')
+    client.subscribe(lambda: 'glob', pattern='test:j*', ignore_result=True)
+    client.subscribe(lambda: 'local', pattern='test:local')
+
+    async def main():
+        await connect(worker, client)
+        return [
+            await client.dispatch('test:job'),
+            await client.dispatch('test:local'),
+        ]
+
+    assert loop.run_until_complete(main()) == ['remote', 'local']
+
+
+def test_results_published_to_glob_listeners(loop, make, connect):
+    worker, client, listener = make('worker'), make('client'), make('other')
+    received = []
+    worker.subscribe(lambda x: x, pattern='test:task')
+    listener.subscribe(lambda payload: received.append(payload),
+                       pattern='test:task:on_*',
+                       ignore_result=True)
+
+    async def main():
+        await connect(worker, client, listener)
+        result = await client.dispatch('test:task', x=1)
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        return result
+
+    assert loop.run_until_complete(main()) == 1
+    assert received == [1]
+
+
+def test_instances_keep_their_own_handlers(make):
+    first, second = make('first'), make('second')
+    first.subscribe(lambda: None, pattern='test:own')
+    assert len(first.coroutines) == 1
+    assert second.coroutines == []
+
+
+def test_pool_stats_cover_every_pool(loop, make, connect):
+    instance = make('pools')
+
+    async def main():
+        await connect(instance)
+        await instance.publish('test:pool', dict(x=1))
+        return instance.get_pool_stats()
+
+    stats = loop.run_until_complete(main())
+    assert set(stats) == set(instance.pools) and 'publisher' in stats
+    for _ in stats.values():
+        assert _['size'] >= 1 and _['freesize'] <= _['size']
+        assert _['acquired'] == 0 and _['mean_wait_seconds'] == 0
@@ -0,0 +1,25 @@
+import os
+import umuus_aioredis_pubsub
+
+pubsub = umuus_aioredis_pubsub.AsyncRedisPubSub(name='test-executor')
+
+
+@pubsub.subscribe(executor='process', pattern='test:executor')
+def get_pid(offset):
+    return os.getpid() + offset
+
+
+def test_process_executor_runs_decorated_handler(loop, make, connect,
+                                                 fake_redis):
+    pubsub.options.redis.update(address=fake_redis.address, password=None)
+    client = make('client')
+
+    async def main():
+        await connect(pubsub, client)
+        return await client.dispatch('test:executor', offset=0)
+
+    try:
+        pid = loop.run_until_complete(main())
+    finally:
+        pubsub.shutdown_executors()
+    assert isinstance(pid, int) and pid != os.getpid()
@@ -0,0 +1,58 @@
+import pytest
+from umuus_aioredis_pubsub import PatternIndex, compile_pattern, is_pattern
+
+
+@pytest.mark.parametrize('pattern, channel, expected', [
+    ('h*o', 'hello', True),
+    ('h*o', 'hell', False),
+    ('*', '', True),
+    ('a?c', 'abc', True),
+    ('a?c', 'ac', False),
+    ('a?c', 'abbc', False),
+    ('a?c', 'a\nc', True),
+    ('[a-c]x', 'bx', True),
+    ('[a-c]x', 'dx', False),
+    ('[^x]y', 'ay', True),
+    ('[^x]y', 'xy', False),
+    ('[z-a]', 'm', True),
+    ('[z-a]', 'A', False),
+    ('a\\*', 'a*', True),
+    ('a\\*', 'ab', False),
+    ('a\\?', 'a?', True),
+    ('a\\?', 'ab', False),
+    ('a[\\]]', 'a]', True),
+    ('a[bc', 'ab', True),
+    ('a[bc', 'ac', True),
+    ('a[bc', 'a[bc', False),
+    ('a[^', 'ab', True),
+    ('a[]b', 'ab', False),
+    ('a.b', 'axb', False),
+    ('a+', 'aa', False),
+])
+def test_compile_pattern_matches_like_redis(pattern, channel, expected):
+    assert bool(compile_pattern(pattern).match(channel)) == expected
+
+
+def test_exact_matches_come_before_globs():
+    index = PatternIndex()
+    index.add('a:b', 'exact').add('a:*', 'glob').add('*', 'all')
+    index.add('a\\:b', 'escaped')
+    assert is_pattern('a\\:b')
+    assert index.match('a:b') == ['exact', 'all', 'escaped', 'glob']
+    assert index.match('a:c') == ['all', 'glob']
+    assert index.match('b') == ['all']
+
+
+def test_remove_rebuilds_lengths():
+    index = PatternIndex()
+    index.add('a:*', 1).add('abc:*', 2).add('abc:*', 3).add('x', 4)
+    assert index.lengths == [2, 4]
+    index.remove('abc:*', 2)
+    assert index.lengths == [2, 4]
+    assert index.match('abc:1') == [3]
+    index.remove('abc:*', 3).remove('abc:*', 3).remove('x', 4)
+    assert index.lengths == [2]
+    assert index.prefixes.keys() == {'a:'}
+    assert index.exact == {}
+    assert index.match('abc:1') == []
+    assert index.match('a:1') == [1]
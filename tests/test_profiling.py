@@ -0,0 +1,19 @@
+import asyncio
+
+
+def test_profiles_never_overlap(loop, make):
+    worker = make('worker')
+
+    async def slow():
+        await asyncio.sleep(0.05)
+
+    handlers = [
+        worker.subscribe(slow, pattern='test:profile:%d' % i)
+        for i in range(2)
+    ]
+    worker.start_profiling('test:profile:*', sample_rate=1)
+    loop.run_until_complete(
+        asyncio.gather(*[_.invoke([]) for _ in handlers * 2]))
+    loop.run_until_complete(handlers[1].invoke([]))
+    report = worker.stop_profiling('test:profile:*')
+    assert sorted(_['samples'] for _ in report.values()) == [1, 1]
@@ -0,0 +1,20 @@
+import asyncio
+import pytest
+
+
+def test_pending_dispatch_fails_after_reply_outage(loop, make, connect,
+                                                   fake_redis):
+    worker = make('worker')
+    client = make('client', dispatch=dict(reply_outage_timeout=0.2))
+    worker.subscribe(lambda: asyncio.sleep(0.5), pattern='test:slow')
+
+    async def main():
+        await connect(worker, client)
+        task = asyncio.ensure_future(client.dispatch('test:slow'))
+        await asyncio.sleep(0.1)
+        fake_redis.server.close()
+        client.replies.close()
+        return await asyncio.wait_for(task, 5)
+
+    with pytest.raises(ConnectionError):
+        loop.run_until_complete(main())
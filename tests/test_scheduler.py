@@ -0,0 +1,68 @@
+import asyncio
+import time
+from umuus_aioredis_pubsub import Lanes, Scheduler
+
+
+def make_lanes(sizes, **options):
+    lanes = Lanes(Scheduler(**options))
+    for priority, size in sizes.items():
+        for i in range(size):
+            lanes.put(priority, (priority, i))
+    return lanes
+
+
+def take(lanes, count):
+    return [lanes.get()[0] for _ in range(count)]
+
+
+def test_lanes_are_picked_by_weight():
+    lanes = make_lanes({0: 10, 1: 10}, weights={'0': 1, '1': 2})
+    assert take(lanes, 6) == [1, 0, 1, 1, 0, 1]
+    lanes = make_lanes({0: 10, 3: 10})
+    assert take(lanes, 9).count(0) == 1
+
+
+def test_zero_weight_runs_only_when_the_others_are_empty():
+    lanes = make_lanes({0: 2, 1: 3}, weights={'0': 0})
+    assert take(lanes, 5) == [1, 1, 1, 0, 0]
+    assert not len(lanes)
+
+
+def test_aging_overrides_the_weights():
+    lanes = make_lanes({0: 1}, aging=0.05)
+    time.sleep(0.06)
+    for i in range(3):
+        lanes.put(5, (5, i))
+    assert take(lanes, 4) == [0, 5, 5, 5]
+    lanes = make_lanes({0: 1}, aging=10)
+    for i in range(3):
+        lanes.put(5, (5, i))
+    assert take(lanes, 4) == [5, 5, 5, 0]
+
+
+def test_pop_lowest_takes_the_oldest_of_the_lowest_lane():
+    lanes = make_lanes({3: 1, 1: 2, 2: 1})
+    assert lanes.pop_lowest() == (1, 0)
+    assert lanes.pop_lowest() == (1, 1)
+    assert lanes.get_sizes() == {3: 1, 2: 1}
+    assert len(lanes) == 2
+
+
+def test_release_skips_cancelled_waiters(loop):
+    scheduler = Scheduler(concurrency=1)
+
+    async def main():
+        await scheduler.acquire()
+        waiters = [asyncio.ensure_future(scheduler.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.wait_for(waiters[1], 1)
+        return waiters
+
+    waiters = loop.run_until_complete(main())
+    assert waiters[0].cancelled()
+    assert scheduler.running == 1
+    assert not len(scheduler.waiters)
+    assert scheduler.get_stats()['waited'] == 2
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+import umuus_aioredis_pubsub
+from fake_redis import FakeRedis
+
+
+@pytest.fixture
+def nodes(loop):
+    servers = [loop.run_until_complete(FakeRedis().start()) for _ in range(3)]
+    yield servers
+    for server in servers:
+        server.close()
+        loop.run_until_complete(server.server.wait_closed())
+
+
+def make_ring(addresses):
+    return umuus_aioredis_pubsub.HashRing([
+        umuus_aioredis_pubsub.Shard(index, address)
+        for index, address in enumerate(addresses)
+    ])
+
+
+def get_mapping(ring, channels):
+    return {_: ring.get(_).address for _ in channels}
+
+
+def test_mapping_is_stable():
+    addresses = ['redis://node%d:6379' % _ for _ in range(3)]
+    channels = ['test:%d' % _ for _ in range(1000)]
+    mapping = get_mapping(make_ring(addresses), channels)
+    assert get_mapping(make_ring(addresses), channels) == mapping
+    assert get_mapping(make_ring(addresses[::-1]), channels) == mapping
+    assert len(set(mapping.values())) == 3
+
+
+def test_adding_a_node_moves_about_one_nth_of_the_channels():
+    addresses = ['redis://node%d:6379' % _ for _ in range(4)]
+    channels = ['test:%d' % _ for _ in range(10000)]
+    before = get_mapping(make_ring(addresses[:3]), channels)
+    after = get_mapping(make_ring(addresses), channels)
+    moved = [_ for _ in channels if before[_] != after[_]]
+    assert all(after[_] == addresses[3] for _ in moved)
+    assert 0.15 < len(moved) / len(channels) < 0.35
+
+
+def test_glob_subscriptions_span_all_nodes(loop, make, connect, nodes):
+    worker = make('worker', redis=dict(nodes=[_.address for _ in nodes]))
+    worker.subscribe(lambda: None, pattern='test:glob:*')
+    loop.run_until_complete(connect(worker))
+    assert all(b'test:glob:*' in _.patterns for _ in nodes)
+
+
+def test_dispatch_round_trip_on_a_ring(loop, make, connect, nodes):
+    addresses = [_.address for _ in nodes]
+    worker = make('worker', redis=dict(nodes=addresses))
+    client = make('client', redis=dict(nodes=addresses[::-1]))
+    patterns = ['test:shard:%d' % _ for _ in range(30)]
+    for pattern in patterns:
+        worker.subscribe(lambda x, pattern=pattern: [pattern, x],
+                         pattern=pattern)
+
+    async def main():
+        await connect(worker, client)
+        return await asyncio.gather(
+            *[client.dispatch(_, x=i) for i, _ in enumerate(patterns)])
+
+    assert loop.run_until_complete(main()) == [
+        [_, i] for i, _ in enumerate(patterns)
+    ]
+    subscribed = [
+        {_.decode() for _ in node.channels} & set(patterns) for node in nodes
+    ]
+    assert all(subscribed)
+    assert sorted(_ for names in subscribed for _ in names) == sorted(patterns)
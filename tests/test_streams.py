@@ -0,0 +1,112 @@
+import asyncio
+
+
+def make_stream_instance(make, name, **streams):
+    return make(name, transport='streams',
+                streams=dict(dict(group='test', block=100), **streams))
+
+
+def get_pending(fake_redis, stream):
+    return fake_redis.streams[stream].groups[b'test'].pending
+
+
+def test_group_shares_messages_between_workers(loop, make, connect):
+    client = make_stream_instance(make, 'client')
+    workers = [
+        make_stream_instance(make, 'worker', consumer=_, count=1)
+        for _ in 'ab'
+    ]
+    handled = []
+    for worker in workers:
+        worker.subscribe(
+            lambda i, consumer=worker.options.streams.consumer: handled.append(
+                (consumer, i)),
+            pattern='test:job')
+
+    async def main():
+        await connect(client, *workers)
+        await asyncio.sleep(0.05)
+        for i in range(20):
+            await client.dispatch('test:job', i=i)
+
+    loop.run_until_complete(main())
+    assert sorted(i for _, i in handled) == list(range(20))
+    assert {consumer for consumer, _ in handled} == {'a', 'b'}
+
+
+def test_entries_are_acked_after_the_reply(loop, make, connect, fake_redis):
+    client = make_stream_instance(make, 'client')
+    worker = make_stream_instance(make, 'worker')
+    replies = []
+    worker.subscribe(lambda x: x, pattern='test:ack')
+    publish = worker.publish
+
+    async def record(channel, obj, codec=None):
+        if channel == client.reply_channel:
+            replies.append(len(get_pending(fake_redis, b'test:ack')))
+        return await publish(channel, obj, codec)
+
+    worker.publish = record
+
+    async def main():
+        await connect(client, worker)
+        await asyncio.sleep(0.05)
+        result = await client.dispatch('test:ack', x=1)
+        for _ in range(100):
+            if not get_pending(fake_redis, b'test:ack'):
+                break
+            await asyncio.sleep(0.01)
+        return result
+
+    assert loop.run_until_complete(main()) == 1
+    assert replies == [1]
+    assert not get_pending(fake_redis, b'test:ack')
+
+
+def test_pending_entries_of_dead_consumers_are_reclaimed(
+        loop, make, connect, fake_redis):
+    client = make_stream_instance(make, 'client')
+    worker = make_stream_instance(
+        make, 'worker', consumer='alive', claim_idle=50, claim_interval=0.05)
+    handled = []
+    worker.subscribe(lambda x: handled.append(x), pattern='test:reclaim')
+
+    async def main():
+        await connect(client)
+        await client.commands.execute(b'XGROUP', b'CREATE', 'test:reclaim',
+                                      'test', '$', b'MKSTREAM')
+        await client.dispatch('test:reclaim', wait=False, x=1)
+        entries = await client.commands.xread_group(
+            'test', 'dead', ['test:reclaim'], latest_ids=['>'])
+        await connect(worker)
+        for _ in range(100):
+            if handled and not get_pending(fake_redis, b'test:reclaim'):
+                break
+            await asyncio.sleep(0.01)
+        return entries
+
+    assert len(loop.run_until_complete(main())) == 1
+    assert handled == [1]
+    assert not get_pending(fake_redis, b'test:reclaim')
+
+
+def test_messages_sent_before_the_group_exists_are_handled(
+        loop, make, connect, fake_redis):
+    client = make_stream_instance(make, 'client')
+    worker = make_stream_instance(make, 'worker')
+    handled = []
+    worker.subscribe(lambda x: handled.append(x) or x, pattern='test:early')
+
+    async def main():
+        await connect(client)
+        await client.dispatch('test:early', wait=False, x=1)
+        await connect(worker)
+        result = await asyncio.wait_for(client.dispatch('test:early', x=2), 5)
+        for _ in range(100):
+            if len(handled) == 2:
+                break
+            await asyncio.sleep(0.01)
+        return result
+
+    assert loop.run_until_complete(main()) == 2
+    assert handled == [1, 2]
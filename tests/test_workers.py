@@ -0,0 +1,54 @@
+import asyncio
+import multiprocessing
+import zlib
+from fake_redis import FakeRedis
+
+
+def test_messages_of_other_workers_are_not_decoded(loop, make, connect):
+    worker = make('worker', worker=dict(index=0, count=2))
+    client = make('client')
+    handled, decoded = [], []
+    worker.subscribe(lambda i: handled.append(i), pattern='test:owned')
+    decode = worker.decode
+    worker.decode = lambda data, channel=None: (
+        decoded.append(data), decode(data, channel))[-1]
+
+    async def main():
+        await connect(worker, client)
+        messages = [client.encode(dict(type='test:owned', payload=dict(i=i)))
+                    for i in range(20)]
+        for message in messages:
+            await client.publisher.publish('test:owned', message)
+        for _ in range(100):
+            if len(handled) == len(decoded) and handled:
+                break
+            await asyncio.sleep(0.01)
+        return [_ for _ in messages if zlib.crc32(_) % 2 == 0]
+
+    owned = loop.run_until_complete(main())
+    assert decoded == owned
+    assert len(handled) == len(owned)
+
+
+def report_reply_channel(instance, connection):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = loop.run_until_complete(FakeRedis().start())
+    instance.options.redis.update(address=server.address)
+    loop.run_until_complete(instance.connect())
+    connection.send(instance.reply_channel)
+
+
+def test_forked_workers_get_their_own_reply_channel(make):
+    instance = make('worker')
+    context = multiprocessing.get_context('fork')
+    channels = []
+    for _ in range(3):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=report_reply_channel, args=(instance, sender))
+        process.start()
+        assert receiver.poll(10)
+        channels.append(receiver.recv())
+        process.join()
+    assert len(set(channels + [instance.reply_channel])) == 4